@@ -17,8 +17,9 @@ User = get_user_model()
 class AuthenticationTestSetup(APITestCase):
     """Base test class with common setup for authentication tests"""
     
-    def setUp(self):
-        self.user_data = {
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_data = {
             'email': 'test@example.com',
             'username': 'testuser',
             'password': 'TestPassword123!',
@@ -26,14 +27,23 @@ class AuthenticationTestSetup(APITestCase):
             'last_name': 'User',
             'phone': '+1234567890'
         }
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             email='existing@example.com',
             username='existinguser',
             password='ExistingPassword123!',
             is_active=True
         )
+        # Signed once per class; blacklisting in a test is rolled back with it
+        cls.user_tokens = cls.get_jwt_tokens(cls.user)
+
+        cls.url_register = reverse('register')
+        cls.url_login = reverse('login')
+        cls.url_logout = reverse('logout')
+        cls.url_sessions = reverse('user-sessions')
+        cls.url_change_password = reverse('change-password')
     
-    def get_jwt_tokens(self, user):
+    @staticmethod
+    def get_jwt_tokens(user):
         """Helper to get JWT tokens for a user"""
         refresh = RefreshToken.for_user(user)
         return {
@@ -44,8 +54,9 @@ class AuthenticationTestSetup(APITestCase):
     def authenticate_user(self, user=None):
         """Helper to authenticate user and set auth header"""
         if user is None:
-            user = self.user
-        tokens = self.get_jwt_tokens(user)
+            user, tokens = self.user, self.user_tokens
+        else:
+            tokens = self.get_jwt_tokens(user)
         
         # Create user session for session-aware authentication
         UserSession.objects.create(
@@ -65,7 +76,7 @@ class RegistrationTestCase(AuthenticationTestSetup):
     
     def test_successful_registration(self):
         """Test successful user registration"""
-        url = reverse('register')
+        url = self.url_register
         response = self.client.post(url, self.user_data)
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -95,7 +106,7 @@ class LoginTestCase(AuthenticationTestSetup):
     
     def test_successful_login(self):
         """Test successful user login"""
-        url = reverse('login')
+        url = self.url_login
         data = {
             'email': self.user.email,
             'password': 'ExistingPassword123!'
@@ -164,7 +175,7 @@ class LogoutTestCase(AuthenticationTestSetup):
             jti=jti
         )
         
-        url = reverse('logout')
+        url = self.url_logout
         data = {'refresh': tokens['refresh']}
         response = self.client.post(url, data)
         
@@ -195,7 +206,7 @@ class SessionManagementTestCase(AuthenticationTestSetup):
     
     def test_list_user_sessions(self):
         """Test listing user sessions"""
-        url = reverse('user-sessions')
+        url = self.url_sessions
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -225,7 +236,7 @@ class PasswordChangeTestCase(AuthenticationTestSetup):
         """Test successful password change"""
         self.authenticate_user()
         
-        url = reverse('change-password')
+        url = self.url_change_password
         data = {
             'current_password': 'ExistingPassword123!',
             'new_password': 'NewPassword456!'
@@ -243,7 +254,7 @@ class PasswordChangeTestCase(AuthenticationTestSetup):
         """Test password change with wrong current password"""
         self.authenticate_user()
         
-        url = reverse('change-password')
+        url = self.url_change_password
         data = {
             'current_password': 'WrongPassword123!',
             'new_password': 'NewPassword456!'
@@ -259,7 +270,7 @@ class SecurityTestCase(AuthenticationTestSetup):
     
     def test_security_attempt_logging(self):
         """Test that security attempts are properly logged"""
-        url = reverse('login')
+        url = self.url_login
         data = {
             'email': 'nonexistent@example.com',
             'password': 'WrongPassword123!'
@@ -295,7 +306,7 @@ class SecurityTestCase(AuthenticationTestSetup):
         self.assertFalse(session.is_active)
         
         # With SessionAwareJWTAuthentication, deactivated sessions should block access
-        url = reverse('change-password')
+        url = self.url_change_password
         data = {
             'current_password': 'ExistingPassword123!',
             'new_password': 'NewPassword456!'
@@ -0,0 +1,67 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+class _BackgroundQueueHandler(QueueHandler):
+    """
+    QueueHandler whose QueueListener thread writes to ``handler``. The thread
+    is started on the first emit in each process: threads don't survive
+    fork(), so one started while logging is configured in a preloading parent
+    (gunicorn --preload) would leave every worker's records queued forever.
+    """
+
+    def __init__(self, handler):
+        super().__init__(queue.SimpleQueue())
+        self.handler = handler
+        self.listener = None
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+
+    def emit(self, record):
+        if self._listener_pid != os.getpid():
+            self._start_listener()
+        super().emit(record)
+
+    def _start_listener(self):
+        with self._listener_lock:
+            pid = os.getpid()
+            if self._listener_pid == pid:
+                return
+            # Records queued before a fork belong to the parent's listener
+            self.queue = queue.SimpleQueue()
+            self.listener = QueueListener(self.queue, self.handler, respect_handler_level=True)
+            self.listener.start()
+            self._listener_pid = pid
+            atexit.register(self._stop_listener, pid)
+
+    def _stop_listener(self, pid):
+        # atexit hooks are inherited across fork; only stop this process's listener
+        if pid is not None and self._listener_pid == pid:
+            self.listener.stop()
+            self._listener_pid = None
+
+
+class QueuedFileHandler(_BackgroundQueueHandler):
+    """
+    Logging handler that hands records to a background thread, which writes
+    them to a FileHandler. Keeps file I/O off the request path.
+    """
+
+    def __init__(self, filename, mode='a', encoding=None):
+        # logs/ is git-ignored, so a fresh checkout doesn't have it
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        super().__init__(logging.FileHandler(filename, mode=mode, encoding=encoding, delay=True))
+
+
+class QueuedStreamHandler(_BackgroundQueueHandler):
+    """
+    Logging handler that hands records to a background thread, which writes
+    them to a StreamHandler (stderr by default).
+    """
+
+    def __init__(self, stream=None):
+        super().__init__(logging.StreamHandler(stream))
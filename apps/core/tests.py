@@ -1,3 +1,44 @@
-from django.test import TestCase
+import io
+import logging
+import os
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from .log_handlers import QueuedStreamHandler
+
+
+class QueuedStreamHandlerTestCase(SimpleTestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.handler = QueuedStreamHandler(self.stream)
+        self.logger = logging.getLogger('apps.core.tests.queued')
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+
+    def tearDown(self):
+        self.handler._stop_listener(self.handler._listener_pid)
+
+    def test_listener_starts_on_first_emit(self):
+        """Test no writer thread runs until something is logged"""
+        self.assertIsNone(self.handler.listener)
+
+        self.logger.warning('first record')
+        self.handler._stop_listener(os.getpid())
+
+        self.assertIn('first record', self.stream.getvalue())
+
+    def test_listener_restarts_in_forked_process(self):
+        """Test a process with a new pid gets its own writer thread"""
+        self.logger.warning('in parent')
+        parent_listener = self.handler.listener
+
+        child_pid = os.getpid() + 1
+        with mock.patch('apps.core.log_handlers.os.getpid', return_value=child_pid):
+            self.logger.warning('in child')
+        self.assertIsNot(self.handler.listener, parent_listener)
+
+        parent_listener.stop()
+        self.handler._stop_listener(child_pid)
+        self.assertIn('in child', self.stream.getvalue())
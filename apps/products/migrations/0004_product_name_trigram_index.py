@@ -0,0 +1,34 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Admin search on product__name (WishlistItemAdmin and friends) runs icontains,
+# which Postgres compiles to UPPER(name::text) LIKE UPPER('%term%').
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(
+        "CREATE INDEX products_product_name_trgm ON products_product "
+        "USING gin (UPPER(name::text) gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("DROP INDEX IF EXISTS products_product_name_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0003_alter_additionalinfo_product"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -1,7 +1,35 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+from django.db.models import Q
 from .models import User, Address, UserProfile
 
+class SearchVectorAdminMixin:
+    """
+    Search the GIN-indexed ``search_vector`` column on Postgres instead of
+    running ILIKE '%term%' over every ``search_fields`` entry. The ``user__*``
+    entries become a case-insensitive exact match on the owner. Other backends
+    (SQLite in development/tests) keep Django's default search.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term or connection.vendor != 'postgresql':
+            return super().get_search_results(request, queryset, search_term)
+
+        term = search_term.strip()
+        query = SearchQuery(term, config='simple', search_type='websearch')
+        owner_match = Q()
+        for field in self.get_search_fields(request):
+            if field.startswith('user__'):
+                owner_match |= Q(**{f"{field.removeprefix('user__')}__iexact": term})
+        # Match the owner through a subquery so both branches of the OR stay on
+        # this table (a JOIN to users_user would rule out the GIN index)
+        owners = User.objects.filter(owner_match).values('pk')
+        queryset = queryset.filter(Q(search_vector=query) | Q(user_id__in=owners))
+        return queryset, False
+
 class AddressInline(admin.TabularInline):
     model = Address
     extra = 0
@@ -24,7 +52,7 @@ class UserProfileInline(admin.StackedInline):
 class UserAdmin(BaseUserAdmin):
     list_display = ('username', 'email', 'first_name', 'last_name', 'phone', 'is_staff', 'email_verified_at', 'date_joined')
     list_filter = ('is_staff', 'is_superuser', 'is_active', 'email_verified_at', 'locale', 'timezone')
-    search_fields = ('username', 'email', 'first_name', 'last_name', 'phone')
+    search_fields = ('username', 'email', 'phone')  # trigram-indexed, see migration 0006
     ordering = ('-date_joined',)
     inlines = [UserProfileInline, AddressInline]
     
@@ -34,8 +62,15 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
 
+    def get_inlines(self, request, obj):
+        # The post_save signal creates the profile; editing it inline on the
+        # add page would insert a second one
+        if obj is None:
+            return [AddressInline]
+        return super().get_inlines(request, obj)
+
 @admin.register(Address)
-class AddressAdmin(admin.ModelAdmin):
+class AddressAdmin(SearchVectorAdminMixin, admin.ModelAdmin):
     list_display = ('user', 'full_name', 'kind', 'line1', 'city', 'country', 'is_default', 'created_at')
     list_filter = ('kind', 'country', 'city', 'is_default')
     search_fields = ('user__username', 'user__email', 'full_name', 'line1', 'city', 'postal_code')
@@ -58,8 +93,12 @@ class AddressAdmin(admin.ModelAdmin):
     )
     readonly_fields = ('created_at', 'updated_at')
 
+class UserProfileChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        return super().get_queryset(request, exclude_parameters).for_list()
+
 @admin.register(UserProfile)
-class UserProfileAdmin(admin.ModelAdmin):
+class UserProfileAdmin(SearchVectorAdminMixin, admin.ModelAdmin):
     list_display = (
         'user', 'full_name', 'membership_tier', 'loyalty_points', 
         'marketing_emails', 'created_at'
@@ -98,6 +137,12 @@ class UserProfileAdmin(admin.ModelAdmin):
     )
     readonly_fields = ('created_at', 'updated_at')
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user')
+
+    def get_changelist(self, request, **kwargs):
+        return UserProfileChangeList
+
     def full_name(self, obj):
         return obj.full_name
     full_name.short_description = 'Full Name'
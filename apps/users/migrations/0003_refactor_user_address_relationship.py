@@ -1,8 +1,64 @@
 # Generated manually for refactoring User-Address relationship
-from django.db import migrations, models
+from itertools import islice
+
+from django.db import migrations, models, transaction
 import django.db.models.deletion
 from django.conf import settings
 
+BATCH_SIZE = 5000
+
+
+def copy_user_addresses(apps, schema_editor):
+    """
+    Move UserAddress links onto Address.user in batches.
+
+    The first link to an address claims the existing row; further links from
+    other users get their own copy of the address.
+    """
+    Address = apps.get_model('users', 'Address')
+    UserAddress = apps.get_model('users', 'UserAddress')
+    db_alias = schema_editor.connection.alias
+
+    copied_fields = [
+        field.attname for field in Address._meta.concrete_fields
+        if not field.primary_key
+    ]
+    links = (
+        UserAddress.objects.using(db_alias)
+        .order_by('pk')
+        .values_list('user_id', 'address_id', 'is_default', 'label')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    claimed = set()
+
+    while batch := list(islice(links, BATCH_SIZE)):
+        addresses = Address.objects.using(db_alias).in_bulk(
+            {address_id for _, address_id, _, _ in batch}
+        )
+        to_update = []
+        to_create = []
+
+        for user_id, address_id, is_default, label in batch:
+            address = addresses[address_id]
+            if address_id in claimed:
+                address = Address(**{
+                    name: getattr(address, name) for name in copied_fields
+                })
+                to_create.append(address)
+            else:
+                claimed.add(address_id)
+                to_update.append(address)
+            address.user_id = user_id
+            address.is_default = is_default
+            address.label = label
+
+        with transaction.atomic(using=db_alias):
+            Address.objects.using(db_alias).bulk_update(
+                to_update, ['user', 'is_default', 'label'], batch_size=BATCH_SIZE
+            )
+            Address.objects.using(db_alias).bulk_create(to_create, batch_size=BATCH_SIZE)
+
+
 class Migration(migrations.Migration):
 
     dependencies = [
@@ -49,7 +105,10 @@ class Migration(migrations.Migration):
             index=models.Index(fields=['user', 'is_default'], name='users_address_user_is_default_idx'),
         ),
         
-        # Step 4: Remove UserAddress model (after step 5 data migration)
+        # Step 4: Copy UserAddress links onto Address.user
+        migrations.RunPython(copy_user_addresses, migrations.RunPython.noop),
+
+        # Step 5: Remove UserAddress model (after step 4 data migration)
         migrations.DeleteModel(
             name='UserAddress',
         ),
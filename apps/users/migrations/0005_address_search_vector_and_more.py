@@ -0,0 +1,58 @@
+# Generated by Django 5.1.3 on 2026-10-16 03:50
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# (table, columns fed into the tsvector)
+SEARCH_VECTOR_SOURCES = [
+    ("users_address", ("full_name", "line1", "city", "postal_code")),
+    ("users_userprofile", ("bio",)),
+]
+
+
+def create_search_triggers(apps, schema_editor):
+    """GIN index + trigger keeping search_vector in sync (Postgres only)."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for table, columns in SEARCH_VECTOR_SOURCES:
+        schema_editor.execute(
+            f"CREATE INDEX {table}_search_vector_gin ON {table} USING gin (search_vector)"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {table}_search_vector_update "
+            f"BEFORE INSERT OR UPDATE ON {table} FOR EACH ROW EXECUTE FUNCTION "
+            f"tsvector_update_trigger(search_vector, 'pg_catalog.simple', {', '.join(columns)})"
+        )
+        # Touch existing rows so the trigger backfills them
+        schema_editor.execute(f"UPDATE {table} SET {columns[0]} = {columns[0]}")
+
+
+def drop_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for table, _ in SEARCH_VECTOR_SOURCES:
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table}")
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_search_vector_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_userprofile_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="address",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_triggers, drop_search_triggers),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-16 03:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['user', 'kind'], name='users_address_user_kind_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.3 on 2026-10-16 03:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_address_user_kind_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='userprofile',
+            name='users_userp_loyalty_cb5838_idx',
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['-loyalty_points', '-created_at'], name='users_up_loyalty_created_idx'),
+        ),
+    ]
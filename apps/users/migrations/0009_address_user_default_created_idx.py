@@ -0,0 +1,21 @@
+# Generated by Django 5.1.3 on 2026-10-16 04:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_userprofile_loyalty_created_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='address',
+            name='users_addre_user_id_194804_idx',
+        ),
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['user', '-is_default', '-created_at'], name='users_addr_default_created_idx'),
+        ),
+    ]
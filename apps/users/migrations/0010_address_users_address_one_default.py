@@ -0,0 +1,35 @@
+# Generated by Django 5.1.3 on 2026-10-16 04:10
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def demote_duplicate_defaults(apps, schema_editor):
+    """Keep only the most recently updated default per user before adding the constraint"""
+    Address = apps.get_model("users", "Address")
+    user_ids = (
+        Address.objects.filter(is_default=True)
+        .values("user_id")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+        .values_list("user_id", flat=True)
+    )
+    for user_id in user_ids:
+        defaults = Address.objects.filter(user_id=user_id, is_default=True)
+        keep = defaults.order_by("-updated_at", "-id").values_list("id", flat=True).first()
+        defaults.exclude(pk=keep).update(is_default=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_address_user_default_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(demote_duplicate_defaults, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='address',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_default', True)), fields=('user',), name='users_address_one_default'),
+        ),
+    ]
@@ -1,3 +1,5 @@
 from .user import User
 from .address import Address
-from .user_profile import UserProfile
\ No newline at end of file
+from .user_profile import UserProfile
+
+__all__ = ['User', 'Address', 'UserProfile']
@@ -1,6 +1,9 @@
 # users/models/address.py
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models import Q
+from django.utils import timezone
 
 class Address(models.Model):
     class Kind(models.TextChoices):
@@ -29,17 +32,94 @@ class Address(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Maintained by a database trigger on Postgres, used by the admin search
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         indexes = [
-            models.Index(fields=["user", "is_default"]),
+            # Matches UserAddressListView's ordering; its prefix serves is_default lookups
+            models.Index(fields=["user", "-is_default", "-created_at"], name="users_addr_default_created_idx"),
+            models.Index(fields=["user", "kind"], name="users_address_user_kind_idx"),
             models.Index(fields=["city", "country"]),
         ]
+        constraints = [
+            # At most one default address per user
+            models.UniqueConstraint(
+                fields=["user"], condition=Q(is_default=True), name="users_address_one_default"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.full_name} — {self.line1}, {self.city}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Snapshot loaded values so save() can narrow its UPDATE
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        # Reloaded values are the new baseline for _changed_fields()
+        refreshed = {
+            field.attname for field in self._meta.concrete_fields
+            if fields is None or field.name in fields or field.attname in fields
+        }
+        self._loaded_values = {
+            **getattr(self, '_loaded_values', {}),
+            **{attname: getattr(self, attname) for attname in refreshed if attname in self.__dict__},
+        }
+
+    def _changed_fields(self):
+        """
+        Names of fields whose value differs from the database row, or None when
+        that can't be told (deferred fields, or fields loaded after the snapshot)
+        """
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None or self.get_deferred_fields():
+            return None
+        if any(field.attname not in loaded for field in self._meta.concrete_fields):
+            return None
+        return {
+            field.name for field in self._meta.concrete_fields
+            if getattr(self, field.attname) != loaded[field.attname]
+        }
+
+    @classmethod
+    def set_default(cls, user_id, address_id, updated_at=None):
+        """Make address_id the user's only default address"""
+        updated_at = updated_at or timezone.now()
+        # Demote before promoting: the one-default constraint is checked per row,
+        # so a single CASE UPDATE could trip it depending on row order
+        with transaction.atomic():
+            cls.objects.filter(user_id=user_id, is_default=True).exclude(pk=address_id).update(
+                is_default=False, updated_at=updated_at
+            )
+            return cls.objects.filter(pk=address_id, user_id=user_id).update(
+                is_default=True, updated_at=updated_at
+            )
+
     def save(self, *args, **kwargs):
-        # Ensure only one default address per user
+        # Only write is_default when toggling the default flag
+        if not self._state.adding and not args and kwargs.get('update_fields') is None:
+            changed = self._changed_fields()
+            if changed is not None and changed <= {'is_default'}:
+                kwargs['update_fields'] = ['is_default', 'updated_at']
+
+        # Ensure only one default address per user. Another address may have been
+        # made default since this one was loaded, so demote even if it already was
         if self.is_default:
-            Address.objects.filter(user=self.user, is_default=True).update(is_default=False)
-        super().save(*args, **kwargs)
+            # Demote and save together so the user is never left without a default
+            with transaction.atomic():
+                Address.objects.filter(
+                    user_id=self.user_id, is_default=True
+                ).exclude(pk=self.pk).update(is_default=False)
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
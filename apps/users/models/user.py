@@ -25,10 +25,14 @@ class User(AbstractUser):
     @property
     def default_address(self):
         """Get user's default address"""
-        try:
-            return self.addresses.filter(is_default=True).first()
-        except:
-            return None
+        return self.addresses.filter(is_default=True).first()
+
+    @property
+    def default_address_id(self):
+        """Get the ID of user's default address without loading the row"""
+        if 'addresses' in getattr(self, '_prefetched_objects_cache', {}):
+            return next((a.id for a in self.addresses.all() if a.is_default), None)
+        return self.addresses.filter(is_default=True).values_list('id', flat=True).first()
     
     def get_addresses_by_kind(self, kind):
         """Get addresses filtered by kind (shipping, billing, etc.)"""
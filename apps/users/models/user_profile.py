@@ -1,6 +1,36 @@
+from bisect import bisect_right
+
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator
+from django.db.models import Case, F, Value, When
+from django.db.models.lookups import GreaterThanOrEqual
+
+
+class UserProfileQuerySet(models.QuerySet):
+    def for_list(self):
+        """Skip the bio/URL columns that list views never display"""
+        return self.only(
+            'user', 'avatar', 'membership_tier', 'loyalty_points',
+            'marketing_emails', 'created_at', 'updated_at'
+        )
+
+    def add_loyalty_points(self, points):
+        """Add loyalty points to every profile in the queryset with a single UPDATE"""
+        if points <= 0:
+            return 0
+        new_points = F('loyalty_points') + points
+        # Tier is recomputed in SQL from the post-update balance, highest first
+        tiers = zip(self.model.MEMBERSHIP_TIER_THRESHOLDS, self.model.MEMBERSHIP_TIERS[1:])
+        membership_tier = Case(
+            *(
+                When(GreaterThanOrEqual(new_points, threshold), then=Value(tier))
+                for threshold, tier in reversed(list(tiers))
+            ),
+            default=Value(self.model.MembershipTier.BRONZE),
+        )
+        return self.update(loyalty_points=new_points, membership_tier=membership_tier)
 
 
 class UserProfile(models.Model):
@@ -16,6 +46,25 @@ class UserProfile(models.Model):
         GOLD = 'gold', 'Gold'
         PLATINUM = 'platinum', 'Platinum'
 
+    # Loyalty points needed to reach each tier above bronze
+    MEMBERSHIP_TIER_THRESHOLDS = (1000, 5000, 10000)
+    MEMBERSHIP_TIERS = (
+        MembershipTier.BRONZE,
+        MembershipTier.SILVER,
+        MembershipTier.GOLD,
+        MembershipTier.PLATINUM,
+    )
+
+    # Discount percentage granted by each membership tier
+    LOYALTY_DISCOUNTS = {
+        MembershipTier.BRONZE: 0,
+        MembershipTier.SILVER: 5,
+        MembershipTier.GOLD: 10,
+        MembershipTier.PLATINUM: 15,
+    }
+
+    objects = UserProfileQuerySet.as_manager()
+
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL, 
         on_delete=models.CASCADE, 
@@ -67,12 +116,16 @@ class UserProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Maintained by a database trigger on Postgres, used by the admin search
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         verbose_name = 'User Profile'
         verbose_name_plural = 'User Profiles'
         indexes = [
             models.Index(fields=['membership_tier']),
-            models.Index(fields=['loyalty_points']),
+            # Matches UserProfileAdmin.ordering so the changelist needs no sort
+            models.Index(fields=['-loyalty_points', '-created_at'], name='users_up_loyalty_created_idx'),
         ]
 
     def save(self, *args, **kwargs):
@@ -108,9 +161,9 @@ class UserProfile(models.Model):
     def add_loyalty_points(self, points):
         """Add loyalty points and update membership tier if needed"""
         if points > 0:
+            UserProfile.objects.filter(pk=self.pk).add_loyalty_points(points)
             self.loyalty_points += points
             self._update_membership_tier()
-            self.save(update_fields=['loyalty_points', 'membership_tier'])
 
     def deduct_loyalty_points(self, points):
         """Deduct loyalty points (for redemption)"""
@@ -123,21 +176,10 @@ class UserProfile(models.Model):
 
     def _update_membership_tier(self):
         """Update membership tier based on loyalty points"""
-        if self.loyalty_points >= 10000:
-            self.membership_tier = self.MembershipTier.PLATINUM
-        elif self.loyalty_points >= 5000:
-            self.membership_tier = self.MembershipTier.GOLD
-        elif self.loyalty_points >= 1000:
-            self.membership_tier = self.MembershipTier.SILVER
-        else:
-            self.membership_tier = self.MembershipTier.BRONZE
+        self.membership_tier = self.MEMBERSHIP_TIERS[
+            bisect_right(self.MEMBERSHIP_TIER_THRESHOLDS, self.loyalty_points)
+        ]
 
     def get_loyalty_discount_percentage(self):
         """Get discount percentage based on membership tier"""
-        discount_map = {
-            self.MembershipTier.BRONZE: 0,
-            self.MembershipTier.SILVER: 5,
-            self.MembershipTier.GOLD: 10,
-            self.MembershipTier.PLATINUM: 15,
-        }
-        return discount_map.get(self.membership_tier, 0)
\ No newline at end of file
+        return self.LOYALTY_DISCOUNTS.get(self.membership_tier, 0)
\ No newline at end of file
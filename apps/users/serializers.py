@@ -46,13 +46,15 @@ class UserMeSerializer(serializers.ModelSerializer):
     @extend_schema_field(serializers.IntegerField)
     def get_addresses_count(self, obj):
         """Get total number of addresses for the user"""
+        # Reuse prefetched addresses (see UserMeView) instead of issuing a COUNT
+        if 'addresses' in getattr(obj, '_prefetched_objects_cache', {}):
+            return len(obj.addresses.all())
         return obj.addresses.count()
 
     @extend_schema_field(serializers.IntegerField)
     def get_default_address_id(self, obj):
         """Get the ID of user's default address"""
-        default_address = obj.default_address
-        return default_address.id if default_address else None
+        return obj.default_address_id
 
 
 class AddressSerializer(serializers.ModelSerializer):
@@ -67,6 +69,14 @@ class AddressSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ('id', 'created_at', 'updated_at')
 
+    def to_representation(self, instance):
+        # Every field is a plain model column, so skip DRF's per-field dispatch;
+        # only the timestamps need formatting
+        timestamp = self.fields['created_at'].to_representation
+        data = {name: getattr(instance, name) for name in self.Meta.fields}
+        data['created_at'] = timestamp(instance.created_at)
+        data['updated_at'] = timestamp(instance.updated_at)
+        return data
 
 
 class UserUpdateSerializer(serializers.ModelSerializer):
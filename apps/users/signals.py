@@ -0,0 +1,12 @@
+from django.conf import settings
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import UserProfile
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_user_profile(sender, instance, created, raw=False, **kwargs):
+    """Give every new user a profile so /me/ doesn't have to create one"""
+    if created and not raw:
+        UserProfile.objects.create(user=instance)
@@ -1,78 +1,87 @@
+from django.db import IntegrityError, transaction
 from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from datetime import date, timedelta
-from rest_framework.test import APITestCase
-from rest_framework import status
+from rest_framework.test import APISimpleTestCase, APITestCase
+from rest_framework import serializers, status
 from rest_framework_simplejwt.tokens import RefreshToken
 from .models import Address, UserProfile
+from .serializers import AddressSerializer
 from apps.authentication.models import UserSession
 
 User = get_user_model()
 
+def make_user(username, **fields):
+    """
+    Create a user without hashing a password (for tests that never log in).
+    bulk_create skips post_save, so no profile is created; tests add their own.
+    """
+    user = User(username=username, **fields)
+    user.set_unusable_password()
+    return User.objects.bulk_create([user])[0]
+
 class UserAddressTestCase(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data"""
-        self.user1 = User.objects.create_user(
-            username="testuser1",
-            email="user1@example.com",
-            password="testpass123",
-            phone="+212600123456"
-        )
-        
-        self.user2 = User.objects.create_user(
-            username="testuser2", 
-            email="user2@example.com",
-            password="testpass123"
-        )
-        
-        # Create addresses for user1
-        self.home_address = Address.objects.create(
-            user=self.user1,
-            kind=Address.Kind.SHIPPING,
-            full_name="John Doe",
-            line1="123 Main St",
-            city="Casablanca",
-            country="MA",
-            phone="+212600123456",
-            label="Home"
-        )
-        
-        self.work_address = Address.objects.create(
-            user=self.user1,
-            kind=Address.Kind.BILLING,
-            full_name="John Doe",
-            line1="456 Office Blvd",
-            line2="Suite 789",
-            city="Rabat",
-            region="Rabat-Salé-Kénitra",
-            postal_code="10000",
-            country="MA",
-            label="Work"
-        )
-        
-        self.other_address = Address.objects.create(
-            user=self.user2,
-            kind=Address.Kind.OTHER,
-            full_name="Jane Smith",
-            line1="789 Friend Ave",
-            city="Marrakech",
-            country="MA",
-            label="Friend's Place"
-        )
+        # These users never log in, so skip hashing and insert them together
+        users = [
+            User(username="testuser1", email="user1@example.com", phone="+212600123456"),
+            User(username="testuser2", email="user2@example.com"),
+        ]
+        for user in users:
+            user.set_unusable_password()
+        cls.user1, cls.user2 = User.objects.bulk_create(users)
+        
+        # Create addresses for user1 (home, work) and user2 (other)
+        cls.home_address, cls.work_address, cls.other_address = Address.objects.bulk_create([
+            Address(
+                user=cls.user1,
+                kind=Address.Kind.SHIPPING,
+                full_name="John Doe",
+                line1="123 Main St",
+                city="Casablanca",
+                country="MA",
+                phone="+212600123456",
+                label="Home"
+            ),
+            Address(
+                user=cls.user1,
+                kind=Address.Kind.BILLING,
+                full_name="John Doe",
+                line1="456 Office Blvd",
+                line2="Suite 789",
+                city="Rabat",
+                region="Rabat-Salé-Kénitra",
+                postal_code="10000",
+                country="MA",
+                label="Work"
+            ),
+            Address(
+                user=cls.user2,
+                kind=Address.Kind.OTHER,
+                full_name="Jane Smith",
+                line1="789 Friend Ave",
+                city="Marrakech",
+                country="MA",
+                label="Friend's Place"
+            ),
+        ])
 
     def test_user_can_have_multiple_addresses(self):
         """Test that a user can have multiple addresses"""
         # user1 already has home_address and work_address from setUp
-        self.assertEqual(self.user1.addresses.count(), 2)
-        self.assertTrue(self.user1.addresses.filter(kind=Address.Kind.SHIPPING).exists())
-        self.assertTrue(self.user1.addresses.filter(kind=Address.Kind.BILLING).exists())
+        addresses = list(self.user1.addresses.all())
+        self.assertEqual(len(addresses), 2)
+        kinds = {address.kind for address in addresses}
+        self.assertIn(Address.Kind.SHIPPING, kinds)
+        self.assertIn(Address.Kind.BILLING, kinds)
 
     def test_default_address_functionality(self):
         """Test default address behavior"""
-        # Set home address as default
-        self.home_address.is_default = True
-        self.home_address.save()
+        # Set home address as default (data setup only, no save() logic needed)
+        Address.objects.filter(pk=self.home_address.pk).update(is_default=True)
         
         # Set work address as default (should override previous default)
         self.work_address.is_default = True
@@ -86,6 +95,101 @@ class UserAddressTestCase(TestCase):
         self.home_address.refresh_from_db()
         self.assertFalse(self.home_address.is_default)
 
+    def test_saving_stale_default_demotes_new_default(self):
+        """Test re-saving an address loaded as default demotes the current default"""
+        Address.objects.filter(pk=self.home_address.pk).update(is_default=True)
+        home = Address.objects.get(pk=self.home_address.pk)
+
+        Address.set_default(self.user1.id, self.work_address.id)
+
+        home.label = "Home sweet home"
+        home.save()
+
+        self.assertEqual(self.user1.default_address, home)
+        self.work_address.refresh_from_db()
+        self.assertFalse(self.work_address.is_default)
+
+    def test_default_address_property(self):
+        """Test default_address returns the address flagged as default"""
+        self.assertIsNone(self.user1.default_address)
+
+        Address.objects.filter(pk=self.work_address.pk).update(is_default=True)
+        self.assertEqual(self.user1.default_address, self.work_address)
+        self.assertEqual(self.user1.default_address_id, self.work_address.id)
+
+    def test_default_toggle_only_writes_is_default(self):
+        """Test toggling is_default on a loaded address leaves other columns untouched"""
+        address = Address.objects.get(id=self.home_address.id)
+
+        # Simulate a concurrent edit made after the address was loaded
+        Address.objects.filter(id=address.id).update(line1="1 Concurrent St")
+
+        address.is_default = True
+        address.save()
+
+        address.refresh_from_db()
+        self.assertTrue(address.is_default)
+        self.assertEqual(address.line1, "1 Concurrent St")
+
+    def test_save_writes_field_deferred_at_load(self):
+        """Test assigning a field that was deferred at load time is saved"""
+        address = Address.objects.only('id', 'user_id', 'is_default').get(id=self.home_address.id)
+        address.line1 = "1 Deferred St"
+        address.save()
+
+        address = Address.objects.get(id=self.home_address.id)
+        self.assertEqual(address.line1, "1 Deferred St")
+
+    def test_save_after_refresh_writes_reverted_field(self):
+        """Test refresh_from_db resets the values save() compares against"""
+        address = Address.objects.get(id=self.home_address.id)
+        Address.objects.filter(id=address.id).update(line1="2 Refreshed St")
+        address.refresh_from_db()
+
+        # Revert to the value first loaded, then toggle the default flag
+        address.line1 = self.home_address.line1
+        address.is_default = True
+        address.save()
+
+        address = Address.objects.get(id=self.home_address.id)
+        self.assertEqual(address.line1, self.home_address.line1)
+        self.assertTrue(address.is_default)
+
+    def test_set_default_swaps_default(self):
+        """Test Address.set_default promotes one address and demotes the old default"""
+        self.home_address.is_default = True
+        self.home_address.save()
+
+        # savepoint, demote, promote, release
+        with self.assertNumQueries(4):
+            Address.set_default(self.user1.id, self.work_address.id)
+
+        self.assertEqual(self.user1.default_address, self.work_address)
+        self.home_address.refresh_from_db()
+        self.assertFalse(self.home_address.is_default)
+
+        # Other users' defaults are untouched
+        Address.set_default(self.user2.id, self.other_address.id)
+        self.assertEqual(self.user1.default_address, self.work_address)
+
+    def test_one_default_per_user_constraint(self):
+        """Test the database rejects a second default address for the same user"""
+        Address.objects.filter(pk=self.home_address.pk).update(is_default=True)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Address.objects.filter(pk=self.work_address.pk).update(is_default=True)
+
+        # Another user's default is independent
+        Address.objects.filter(pk=self.other_address.pk).update(is_default=True)
+
+    def test_address_serializer_matches_generic_representation(self):
+        """Test the flat to_representation emits what ModelSerializer would"""
+        serializer = AddressSerializer(self.work_address)
+        self.assertEqual(
+            serializer.data,
+            serializers.ModelSerializer.to_representation(serializer, self.work_address),
+        )
+
     def test_address_filtering_by_kind(self):
         """Test filtering addresses by kind"""
         # Create additional address for user1
@@ -114,16 +218,15 @@ class UserAddressTestCase(TestCase):
     def test_users_have_separate_addresses(self):
         """Test that each user has their own addresses (no sharing in OneToMany)"""
         # user1 has 2 addresses, user2 has 1 address
-        self.assertEqual(self.user1.addresses.count(), 2)
-        self.assertEqual(self.user2.addresses.count(), 1)
-        
+        user1_ids = set(self.user1.addresses.values_list('id', flat=True))
+        user2_ids = set(self.user2.addresses.values_list('id', flat=True))
+
         # Check that addresses belong to correct users
-        self.assertTrue(self.user1.addresses.filter(id=self.home_address.id).exists())
-        self.assertTrue(self.user1.addresses.filter(id=self.work_address.id).exists())
-        self.assertTrue(self.user2.addresses.filter(id=self.other_address.id).exists())
-        
+        self.assertEqual(user1_ids, {self.home_address.id, self.work_address.id})
+        self.assertEqual(user2_ids, {self.other_address.id})
+
         # user2 should not have access to user1's addresses
-        self.assertFalse(self.user2.addresses.filter(id=self.home_address.id).exists())
+        self.assertNotIn(self.home_address.id, user2_ids)
 
     def test_address_belongs_to_single_user(self):
         """Test that addresses belong to one user only in OneToMany relationship"""
@@ -142,10 +245,9 @@ class UserAddressTestCase(TestCase):
 
     def test_user_without_addresses(self):
         """Test user with no addresses"""
-        empty_user = User.objects.create_user(
+        empty_user = make_user(
             username="emptyuser",
             email="empty@example.com",
-            password="testpass123"
         )
         
         self.assertEqual(empty_user.addresses.count(), 0)
@@ -165,19 +267,19 @@ class UserAddressTestCase(TestCase):
 
 
 class UserProfileTestCase(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data"""
-        self.user = User.objects.create_user(
+        cls.user = make_user(
             username="profileuser",
             email="profile@example.com",
-            password="testpass123",
             first_name="John",
             last_name="Doe"
         )
         
         # Create profile
-        self.profile = UserProfile.objects.create(
-            user=self.user,
+        cls.profile = UserProfile.objects.create(
+            user=cls.user,
             date_of_birth=date(1990, 5, 15),
             gender=UserProfile.Gender.MALE,
             bio="Test bio for user",
@@ -204,60 +306,46 @@ class UserProfileTestCase(TestCase):
         self.assertEqual(self.profile.full_name, "John Doe")
         
         # Test with user without names
-        user_no_names = User.objects.create_user(
+        user_no_names = make_user(
             username="testuser",
             email="test@example.com", 
-            password="testpass123"
         )
         profile_no_names = UserProfile.objects.create(user=user_no_names)
         self.assertEqual(profile_no_names.full_name, "testuser")
 
     def test_age_calculation(self):
         """Test age property calculation"""
-        expected_age = date.today().year - 1990
+        today = date.today()
+        expected_age = today.year - 1990
         # Adjust if birthday hasn't occurred this year
-        if (date.today().month, date.today().day) < (5, 15):
+        if (today.month, today.day) < (5, 15):
             expected_age -= 1
         
         self.assertEqual(self.profile.age, expected_age)
 
     def test_age_without_birth_date(self):
         """Test age property when no birth date is set"""
-        new_user = User.objects.create_user(
+        new_user = make_user(
             username="ageuser",
             email="age@example.com",
-            password="testpass123"
         )
         profile = UserProfile.objects.create(user=new_user)
         self.assertIsNone(profile.age)
 
     def test_loyalty_points_and_membership_tier(self):
         """Test loyalty points and membership tier updates"""
-        # Create new user for this test
-        tier_user = User.objects.create_user(
-            username="loyaltyuser",
-            email="loyalty@example.com",
-            password="testpass123"
-        )
-        
-        # Test bronze tier
-        profile = UserProfile.objects.create(user=tier_user, loyalty_points=500)
-        self.assertEqual(profile.membership_tier, UserProfile.MembershipTier.BRONZE)
-        
-        # Test silver tier (1000+)
-        profile.loyalty_points = 1200
-        profile.save()
-        self.assertEqual(profile.membership_tier, UserProfile.MembershipTier.SILVER)
-        
-        # Test gold tier (5000+)
-        profile.loyalty_points = 6000
-        profile.save()
-        self.assertEqual(profile.membership_tier, UserProfile.MembershipTier.GOLD)
-        
-        # Test platinum tier (10000+)
-        profile.loyalty_points = 15000
-        profile.save()
-        self.assertEqual(profile.membership_tier, UserProfile.MembershipTier.PLATINUM)
+        # save() only calls _update_membership_tier, so no need to hit the DB
+        profile = UserProfile()
+        for points, tier in [
+            (500, UserProfile.MembershipTier.BRONZE),
+            (1200, UserProfile.MembershipTier.SILVER),      # 1000+
+            (6000, UserProfile.MembershipTier.GOLD),        # 5000+
+            (15000, UserProfile.MembershipTier.PLATINUM),   # 10000+
+        ]:
+            with self.subTest(points=points):
+                profile.loyalty_points = points
+                profile._update_membership_tier()
+                self.assertEqual(profile.membership_tier, tier)
 
     def test_add_loyalty_points(self):
         """Test adding loyalty points"""
@@ -273,10 +361,9 @@ class UserProfileTestCase(TestCase):
     def test_add_loyalty_points_tier_promotion(self):
         """Test loyalty points addition that triggers tier promotion"""
         # Start with a new user and profile
-        new_user = User.objects.create_user(
+        new_user = make_user(
             username="tieruser",
             email="tier@example.com",
-            password="testpass123"
         )
         profile = UserProfile.objects.create(user=new_user, loyalty_points=500)
         self.assertEqual(profile.membership_tier, UserProfile.MembershipTier.BRONZE)
@@ -285,6 +372,31 @@ class UserProfileTestCase(TestCase):
         profile.add_loyalty_points(600)  # 500 + 600 = 1100
         self.assertEqual(profile.membership_tier, UserProfile.MembershipTier.SILVER)
 
+        profile.refresh_from_db()
+        self.assertEqual(profile.loyalty_points, 1100)
+        self.assertEqual(profile.membership_tier, UserProfile.MembershipTier.SILVER)
+
+    def test_bulk_add_loyalty_points(self):
+        """Test awarding points to many profiles with a single UPDATE"""
+        other_user = make_user(
+            username="bulkuser",
+            email="bulk@example.com",
+        )
+        other_profile = UserProfile.objects.create(user=other_user, loyalty_points=100)
+
+        with self.assertNumQueries(1):
+            updated = UserProfile.objects.filter(
+                pk__in=[self.profile.pk, other_profile.pk]
+            ).add_loyalty_points(4000)
+        self.assertEqual(updated, 2)
+
+        self.profile.refresh_from_db()
+        other_profile.refresh_from_db()
+        self.assertEqual(self.profile.loyalty_points, 5500)
+        self.assertEqual(self.profile.membership_tier, UserProfile.MembershipTier.GOLD)
+        self.assertEqual(other_profile.loyalty_points, 4100)
+        self.assertEqual(other_profile.membership_tier, UserProfile.MembershipTier.SILVER)
+
     def test_deduct_loyalty_points_success(self):
         """Test successful loyalty points deduction"""
         initial_points = self.profile.loyalty_points  # 1500
@@ -303,43 +415,19 @@ class UserProfileTestCase(TestCase):
 
     def test_loyalty_discount_percentage(self):
         """Test discount percentage based on membership tier"""
-        # Create separate users for each tier test
-        bronze_user = User.objects.create_user(
-            username="bronzeuser",
-            email="bronze@example.com",
-            password="testpass123"
-        )
-        silver_user = User.objects.create_user(
-            username="silveruser",
-            email="silver@example.com",
-            password="testpass123"
-        )
-        gold_user = User.objects.create_user(
-            username="golduser",
-            email="gold@example.com",
-            password="testpass123"
-        )
-        platinum_user = User.objects.create_user(
-            username="platinumuser",
-            email="platinum@example.com",
-            password="testpass123"
-        )
-        
-        # Bronze - 0%
-        bronze_profile = UserProfile.objects.create(user=bronze_user, loyalty_points=500)
-        self.assertEqual(bronze_profile.get_loyalty_discount_percentage(), 0)
-        
-        # Silver - 5%
-        silver_profile = UserProfile.objects.create(user=silver_user, loyalty_points=1500)
-        self.assertEqual(silver_profile.get_loyalty_discount_percentage(), 5)
-        
-        # Gold - 10%
-        gold_profile = UserProfile.objects.create(user=gold_user, loyalty_points=6000)
-        self.assertEqual(gold_profile.get_loyalty_discount_percentage(), 10)
-        
-        # Platinum - 15%
-        platinum_profile = UserProfile.objects.create(user=platinum_user, loyalty_points=12000)
-        self.assertEqual(platinum_profile.get_loyalty_discount_percentage(), 15)
+        # Pure function of loyalty_points, so an unsaved profile is enough
+        profile = UserProfile(user=self.user)
+        expected_discounts = [
+            (500, 0),     # Bronze - 0%
+            (1500, 5),    # Silver - 5%
+            (6000, 10),   # Gold - 10%
+            (12000, 15),  # Platinum - 15%
+        ]
+
+        for loyalty_points, discount in expected_discounts:
+            profile.loyalty_points = loyalty_points
+            profile._update_membership_tier()
+            self.assertEqual(profile.get_loyalty_discount_percentage(), discount)
 
     def test_can_receive_marketing(self):
         """Test marketing communication eligibility"""
@@ -358,6 +446,34 @@ class UserProfileTestCase(TestCase):
         self.profile.save()
         self.assertFalse(self.profile.can_receive_marketing())
 
+    def test_profile_created_with_user(self):
+        """Test saving a new user creates its profile"""
+        user = User.objects.create_user(username="signupuser", email="signup@example.com")
+        self.assertTrue(UserProfile.objects.filter(user=user).exists())
+        self.assertEqual(user.profile.membership_tier, UserProfile.MembershipTier.BRONZE)
+
+        # Later saves leave the existing profile alone
+        user.first_name = "Sign"
+        user.save()
+        self.assertEqual(UserProfile.objects.filter(user=user).count(), 1)
+
+    def test_admin_add_user_creates_one_profile(self):
+        """Test the admin add-user page leaves profile creation to the signal"""
+        admin_user = User.objects.create_superuser(username="admin", email="admin@example.com", password="adminpass")
+        self.client.force_login(admin_user)
+
+        response = self.client.post(reverse('admin:users_user_add'), {
+            'username': 'adminadded',
+            'password1': 'Str0ng-pass-123',
+            'password2': 'Str0ng-pass-123',
+            'usable_password': 'true',
+            'addresses-TOTAL_FORMS': '0',
+            'addresses-INITIAL_FORMS': '0',
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(UserProfile.objects.filter(user__username='adminadded').count(), 1)
+
     def test_profile_one_to_one_relationship(self):
         """Test that each user can have only one profile"""
         # Try to create another profile for the same user
@@ -377,78 +493,73 @@ class UserProfileTestCase(TestCase):
         self.assertFalse(UserProfile.objects.filter(id=profile_id).exists())
 
 
+# Views bind their authentication classes at import time, so overriding
+# REST_FRAMEWORK here leaks into other test modules; force_authenticate
+# makes an override unnecessary anyway.
 @override_settings(
-    REST_FRAMEWORK={
-        'DEFAULT_AUTHENTICATION_CLASSES': (
-            'rest_framework_simplejwt.authentication.JWTAuthentication',
-        ),
-        'DEFAULT_PERMISSION_CLASSES': [
-            'rest_framework.permissions.IsAuthenticated',
-        ],
-    },
     DATABASES={
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': ':memory:',
         }
-    }
+    },
 )
 class UserAPITestCase(APITestCase):
-    def setUp(self):
-        """Set up test data"""
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.url_me = reverse('user-me')
+        cls.url_addresses = reverse('user-addresses')
+
+        cls.user = make_user(
             username="apiuser",
             email="api@example.com",
-            password="testpass123",
             first_name="API",
             last_name="User",
             phone="+212600123456"
         )
         
         # Create profile
-        self.profile = UserProfile.objects.create(
-            user=self.user,
+        cls.profile = UserProfile.objects.create(
+            user=cls.user,
             date_of_birth=date(1985, 3, 20),
             gender=UserProfile.Gender.MALE,
             bio="API test user",
             loyalty_points=2500,
             marketing_emails=True
-        )
-        # Update membership tier based on points
-        self.profile._update_membership_tier()
-        self.profile.save()
+        )  # save() derives membership_tier (silver) from loyalty_points
         
         # Create some addresses
-        self.address1 = Address.objects.create(
-            user=self.user,
-            kind=Address.Kind.SHIPPING,
-            full_name="API User",
-            line1="123 API Street",
-            city="Test City",
-            country="MA",
-            is_default=True,
-            label="Home"
-        )
-        
-        self.address2 = Address.objects.create(
-            user=self.user,
-            kind=Address.Kind.BILLING,
-            full_name="API User", 
-            line1="456 Work Ave",
-            city="Test City",
-            country="MA",
-            label="Office"
-        )
+        cls.address1, cls.address2 = Address.objects.bulk_create([
+            Address(
+                user=cls.user,
+                kind=Address.Kind.SHIPPING,
+                full_name="API User",
+                line1="123 API Street",
+                city="Test City",
+                country="MA",
+                is_default=True,
+                label="Home"
+            ),
+            Address(
+                user=cls.user,
+                kind=Address.Kind.BILLING,
+                full_name="API User",
+                line1="456 Work Ave",
+                city="Test City",
+                country="MA",
+                label="Office"
+            ),
+        ])
 
-    def authenticate_user(self):
-        """Helper to authenticate user"""
+    def setUp(self):
+        # Authenticate as the API user; anonymous-access tests log out explicitly
+        # (DB-free ones live in UnauthUserAPITestCase). Django builds a fresh
+        # client per test, so this can't move to class scope.
         self.client.force_authenticate(user=self.user)
 
     def test_get_me_authenticated(self):
         """Test GET /api/me/ with authenticated user"""
-        self.authenticate_user()
-        
-        url = reverse('user-me')
+        url = self.url_me
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -474,28 +585,27 @@ class UserAPITestCase(APITestCase):
         self.assertEqual(data['addresses_count'], 2)
         self.assertEqual(data['default_address_id'], self.address1.id)
 
-    def test_get_me_unauthenticated(self):
-        """Test GET /api/me/ without authentication"""
-        url = reverse('user-me')
-        response = self.client.get(url)
-        
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    def test_get_me_query_count(self):
+        """The profile and the address summary are one query each"""
+        # A freshly loaded user, as the JWT authentication class returns it
+        self.client.force_authenticate(user=User.objects.get(pk=self.user.pk))
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url_me)
+
+        self.assertEqual(response.data['addresses_count'], 2)
+        self.assertEqual(response.data['default_address_id'], self.address1.id)
 
     def test_get_me_creates_profile_if_missing(self):
         """Test that GET /api/me/ creates profile if user doesn't have one"""
         # Create user without profile
-        user_no_profile = User.objects.create_user(
+        user_no_profile = make_user(
             username="noprofile",
             email="noprofile@example.com", 
-            password="testpass123"
         )
         
         self.client.force_authenticate(user=user_no_profile)
         
-        # Ensure no profile exists
-        self.assertFalse(UserProfile.objects.filter(user=user_no_profile).exists())
-        
-        url = reverse('user-me')
+        url = self.url_me
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -512,16 +622,15 @@ class UserAPITestCase(APITestCase):
     def test_get_me_user_with_no_addresses(self):
         """Test GET /api/me/ for user with no addresses"""
         # Create user with profile but no addresses
-        user_no_addr = User.objects.create_user(
+        user_no_addr = make_user(
             username="noaddr",
             email="noaddr@example.com",
-            password="testpass123"
         )
         UserProfile.objects.create(user=user_no_addr)
         
         self.client.force_authenticate(user=user_no_addr)
         
-        url = reverse('user-me')
+        url = self.url_me
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -530,9 +639,7 @@ class UserAPITestCase(APITestCase):
 
     def test_patch_me_authenticated(self):
         """Test PATCH /api/me/ with authenticated user"""
-        self.authenticate_user()
-        
-        url = reverse('user-me')
+        url = self.url_me
         update_data = {
             'first_name': 'Updated',
             'last_name': 'Name',
@@ -560,9 +667,7 @@ class UserAPITestCase(APITestCase):
 
     def test_patch_me_partial_update(self):
         """Test PATCH /api/me/ with partial data"""
-        self.authenticate_user()
-        
-        url = reverse('user-me')
+        url = self.url_me
         update_data = {
             'first_name': 'NewFirst'
         }
@@ -577,22 +682,9 @@ class UserAPITestCase(APITestCase):
         # Other fields should remain unchanged
         self.assertEqual(self.user.last_name, 'User')  # Original value from setUp
 
-    def test_patch_me_unauthenticated(self):
-        """Test PATCH /api/me/ without authentication"""
-        url = reverse('user-me')
-        update_data = {
-            'first_name': 'Unauthorized'
-        }
-        
-        response = self.client.patch(url, update_data, format='json')
-        
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-
     def test_patch_me_invalid_data(self):
         """Test PATCH /api/me/ with invalid data"""
-        self.authenticate_user()
-        
-        url = reverse('user-me')
+        url = self.url_me
         update_data = {
             'locale': 'invalid_locale_code_too_long'  # This exceeds the max_length=10
         }
@@ -605,9 +697,7 @@ class UserAPITestCase(APITestCase):
 
     def test_get_addresses_authenticated_with_addresses(self):
         """Test GET /api/me/addresses/ with authenticated user who has addresses"""
-        self.authenticate_user()
-        
-        url = reverse('user-addresses')
+        url = self.url_addresses
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -626,38 +716,34 @@ class UserAPITestCase(APITestCase):
             self.assertIn(field, address_data)
         
         # Verify default address comes first
-        self.assertTrue(response.data[0]['is_default'])  # Default address first
-        self.assertFalse(response.data[1]['is_default'])  # Non-default second
+        self.assertEqual(
+            [(d['id'], d['is_default']) for d in response.data],
+            [(self.address1.id, True), (self.address2.id, False)],
+        )
+
+        # The orjson-rendered body carries the same payload
+        self.assertEqual(response.json(), response.data)
 
     def test_get_addresses_authenticated_no_addresses(self):
         """Test GET /api/me/addresses/ with authenticated user who has no addresses"""
         # Create user with no addresses
-        user_no_addr = User.objects.create_user(
+        user_no_addr = make_user(
             username="noaddress",
             email="noaddress@example.com",
-            password="testpass123"
         )
         self.client.force_authenticate(user=user_no_addr)
         
-        url = reverse('user-addresses')
+        url = self.url_addresses
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 0)  # Empty list
         self.assertEqual(response.data, [])
 
-    def test_get_addresses_unauthenticated(self):
-        """Test GET /api/me/addresses/ without authentication"""
-        url = reverse('user-addresses')
-        response = self.client.get(url)
-        
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-
     def test_get_addresses_ordering(self):
         """Test that addresses are ordered by default first, then by creation date"""
-        self.authenticate_user()
-        
-        # Create additional addresses with specific ordering
+        # Create an additional default address (should move to front and
+        # demote address1 on save)
         older_address = Address.objects.create(
             user=self.user,
             kind=Address.Kind.OTHER,
@@ -665,34 +751,30 @@ class UserAPITestCase(APITestCase):
             line1="999 Old Street",
             city="Old City",
             country="MA",
-            label="Old"
+            label="Old",
+            is_default=True
         )
         
-        # Make the older address default (should move to front)
-        older_address.is_default = True
-        older_address.save()
-        
-        url = reverse('user-addresses')
+        url = self.url_addresses
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 3)  # 2 from setUp + 1 new
-        
-        # First address should be the default (older_address)
-        self.assertEqual(response.data[0]['id'], older_address.id)
-        self.assertTrue(response.data[0]['is_default'])
-        
-        # Other addresses should not be default
-        self.assertFalse(response.data[1]['is_default'])
-        self.assertFalse(response.data[2]['is_default'])
+        # The new default first, then the demoted ones newest first
+        self.assertEqual(
+            [(d['id'], d['is_default']) for d in response.data],
+            [
+                (older_address.id, True),
+                (self.address2.id, False),
+                (self.address1.id, False),
+            ],
+        )
 
     def test_get_addresses_user_isolation(self):
         """Test that users only see their own addresses"""
         # Create another user with addresses
-        other_user = User.objects.create_user(
+        other_user = make_user(
             username="otheruser",
             email="other@example.com",
-            password="testpass123"
         )
         Address.objects.create(
             user=other_user,
@@ -703,26 +785,21 @@ class UserAPITestCase(APITestCase):
             country="MA"
         )
         
-        # Authenticate as original user
-        self.authenticate_user()
-        
-        url = reverse('user-addresses')
+        # Still authenticated as the original user from setUp
+        url = self.url_addresses
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 2)  # Only original user's addresses
         
         # Verify all addresses belong to authenticated user
-        for address_data in response.data:
-            # Get the actual address to verify user
-            address = Address.objects.get(id=address_data['id'])
-            self.assertEqual(address.user, self.user)
+        address_ids = [address_data['id'] for address_data in response.data]
+        user_ids = set(Address.objects.filter(id__in=address_ids).values_list('user_id', flat=True))
+        self.assertEqual(user_ids, {self.user.id})
 
     def test_post_address_authenticated(self):
         """Test POST /api/me/addresses/ with authenticated user"""
-        self.authenticate_user()
-        
-        url = reverse('user-addresses')
+        url = self.url_addresses
         address_data = {
             'kind': 'shipping',
             'full_name': 'Jane Doe',
@@ -751,15 +828,13 @@ class UserAPITestCase(APITestCase):
         
         # Verify the address was created in database
         self.assertEqual(Address.objects.filter(user=self.user).count(), 3)  # 2 from setUp + 1 new
-        new_address = Address.objects.get(full_name='Jane Doe')
+        new_address = Address.objects.get(pk=response.data['id'])
         self.assertEqual(new_address.user, self.user)
         self.assertEqual(new_address.line1, '789 New Street')
 
     def test_post_address_minimal_data(self):
         """Test POST /api/me/addresses/ with minimal required data"""
-        self.authenticate_user()
-        
-        url = reverse('user-addresses')
+        url = self.url_addresses
         address_data = {
             'full_name': 'Minimal Address',
             'line1': '123 Simple St',
@@ -776,17 +851,15 @@ class UserAPITestCase(APITestCase):
         self.assertFalse(response.data['is_default'])        # Default is_default
         
         # Verify it was saved
-        new_address = Address.objects.get(full_name='Minimal Address')
+        new_address = Address.objects.get(pk=response.data['id'])
         self.assertEqual(new_address.user, self.user)
 
     def test_post_address_set_as_default(self):
         """Test POST /api/me/addresses/ with is_default=True"""
-        self.authenticate_user()
-        
         # First verify current default
         current_default = Address.objects.get(user=self.user, is_default=True)
         
-        url = reverse('user-addresses')
+        url = self.url_addresses
         address_data = {
             'full_name': 'New Default',
             'line1': '555 Default Ave',
@@ -804,14 +877,12 @@ class UserAPITestCase(APITestCase):
         self.assertFalse(current_default.is_default)
         
         # Verify new address is the default
-        new_address = Address.objects.get(full_name='New Default')
+        new_address = Address.objects.get(pk=response.data['id'])
         self.assertTrue(new_address.is_default)
 
     def test_post_address_missing_required_fields(self):
         """Test POST /api/me/addresses/ with missing required fields"""
-        self.authenticate_user()
-        
-        url = reverse('user-addresses')
+        url = self.url_addresses
         incomplete_data = {
             'line1': '123 Missing Data St'
             # Missing full_name and city (required fields)
@@ -830,7 +901,8 @@ class UserAPITestCase(APITestCase):
 
     def test_post_address_unauthenticated(self):
         """Test POST /api/me/addresses/ without authentication"""
-        url = reverse('user-addresses')
+        self.client.force_authenticate(user=None)
+        url = self.url_addresses
         address_data = {
             'full_name': 'Unauthorized User',
             'line1': '123 Unauthorized St',
@@ -846,9 +918,7 @@ class UserAPITestCase(APITestCase):
 
     def test_post_address_invalid_kind(self):
         """Test POST /api/me/addresses/ with invalid address kind"""
-        self.authenticate_user()
-        
-        url = reverse('user-addresses')
+        url = self.url_addresses
         address_data = {
             'full_name': 'Test User',
             'line1': '123 Test St',
@@ -864,16 +934,13 @@ class UserAPITestCase(APITestCase):
     def test_post_address_user_isolation(self):
         """Test that created addresses belong to the authenticated user only"""
         # Create another user
-        other_user = User.objects.create_user(
+        other_user = make_user(
             username="otheruser2",
             email="other2@example.com",
-            password="testpass123"
         )
         
-        # Authenticate as original user
-        self.authenticate_user()
-        
-        url = reverse('user-addresses')
+        # Still authenticated as the original user from setUp
+        url = self.url_addresses
         address_data = {
             'full_name': 'Isolated Address',
             'line1': '123 Isolated St',
@@ -885,9 +952,44 @@ class UserAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         
         # Verify the address belongs to authenticated user, not other user
-        new_address = Address.objects.get(full_name='Isolated Address')
+        new_address = Address.objects.get(pk=response.data['id'])
         self.assertEqual(new_address.user, self.user)
         self.assertNotEqual(new_address.user, other_user)
         
         # Verify other user has no addresses
         self.assertEqual(Address.objects.filter(user=other_user).count(), 0)
+
+
+class UnauthUserAPITestCase(APISimpleTestCase):
+    """Anonymous access to the user endpoints is rejected before any query runs"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.url_me = reverse('user-me')
+        cls.url_addresses = reverse('user-addresses')
+
+    def test_get_me_unauthenticated(self):
+        """Test GET /api/me/ without authentication"""
+        url = self.url_me
+        response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_patch_me_unauthenticated(self):
+        """Test PATCH /api/me/ without authentication"""
+        url = self.url_me
+        update_data = {
+            'first_name': 'Unauthorized'
+        }
+        
+        response = self.client.patch(url, update_data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_get_addresses_unauthenticated(self):
+        """Test GET /api/me/addresses/ without authentication"""
+        url = self.url_addresses
+        response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -3,14 +3,35 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
+from django.db.models import Prefetch, prefetch_related_objects
 from drf_spectacular.utils import extend_schema
 
+from apps.core.renderers import ORJSONRenderer
+
 from .models import UserProfile, Address
 from .serializers import UserMeSerializer, UserUpdateSerializer, AddressSerializer
 
 User = get_user_model()
 
 
+def _ensure_profile(user):
+    """
+    Load the user's profile without its search vector, creating it for users
+    that predate the post_save signal (see signals.py).
+    """
+    if User.profile.is_cached(user):
+        return
+    user.profile, _ = UserProfile.objects.defer('search_vector').get_or_create(user=user)
+
+
+def _prefetch_address_summary(user):
+    """Load what UserMeSerializer needs for the address summary in one query"""
+    prefetch_related_objects(
+        [user],
+        Prefetch('addresses', queryset=Address.objects.only('id', 'user_id', 'is_default')),
+    )
+
+
 class UserMeView(APIView):
     """
     Get and update current user's profile information
@@ -38,7 +59,8 @@ class UserMeView(APIView):
         user = request.user
         
         # Create profile if it doesn't exist
-        UserProfile.objects.get_or_create(user=user)
+        _ensure_profile(user)
+        _prefetch_address_summary(user)
         
         serializer = UserMeSerializer(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -68,7 +90,7 @@ class UserMeView(APIView):
         user = request.user
         
         # Create profile if it doesn't exist
-        UserProfile.objects.get_or_create(user=user)
+        _ensure_profile(user)
         
         # Update user with provided data
         update_serializer = UserUpdateSerializer(user, data=request.data, partial=True)
@@ -76,6 +98,7 @@ class UserMeView(APIView):
             update_serializer.save()
             
             # Return updated user data
+            _prefetch_address_summary(user)
             response_serializer = UserMeSerializer(user)
             return Response(response_serializer.data, status=status.HTTP_200_OK)
         
@@ -87,6 +110,7 @@ class UserAddressListView(APIView):
     List and create addresses for the authenticated user
     """
     permission_classes = [IsAuthenticated]
+    renderer_classes = [ORJSONRenderer]
 
     @extend_schema(
         summary="List user addresses",
@@ -102,7 +126,7 @@ class UserAddressListView(APIView):
     def get(self, request):
         """Get all user addresses"""
         # Get addresses ordered by default first, then by creation date
-        addresses = Address.objects.filter(user=request.user).order_by(
+        addresses = Address.objects.filter(user=request.user).defer('search_vector').order_by(
             '-is_default',  # Default addresses first
             '-created_at'   # Then newest first
         )
@@ -159,10 +183,9 @@ class UserAddressListView(APIView):
         
         if serializer.is_valid():
             # Save the address with the authenticated user
-            address = serializer.save(user=request.user)
+            serializer.save(user=request.user)
             
             # Return the created address data
-            response_serializer = AddressSerializer(address)
-            return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -24,6 +24,7 @@ class WishlistAdmin(admin.ModelAdmin):
 class WishlistItemAdmin(admin.ModelAdmin):
     list_display = ('id', 'wishlist_user', 'product', 'added_at')
     list_filter = ('added_at',)
+    # trigram-indexed, see users 0006 and products 0004
     search_fields = ('wishlist__user__username', 'wishlist__user__email', 'product__name')
     readonly_fields = ('added_at',)
 
@@ -1,6 +1,7 @@
 from django.conf import settings
-from django.db import models
+from django.db import connection, models
 from django.db.models import UniqueConstraint
+from django.utils import timezone
 
 
 class Wishlist(models.Model):
@@ -27,6 +28,9 @@ class Wishlist(models.Model):
     @property
     def items_count(self) -> int:
         """Return total number of items in wishlist."""
+        # Reuse prefetched items (see views) instead of issuing a COUNT
+        if 'items' in getattr(self, '_prefetched_objects_cache', {}):
+            return len(self.items.all())
         return self.items.count()
 
 
@@ -66,3 +70,31 @@ class WishlistItem(models.Model):
     def __str__(self):
         return f"{self.product.name}"
 
+    @classmethod
+    def add(cls, wishlist, product_id):
+        """
+        Insert product_id into wishlist and return the new item, or None if it
+        is already there. ON CONFLICT (Postgres, SQLite 3.35+) leans on
+        unique_wishlist_product instead of catching IntegrityError.
+        """
+        added_at = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {cls._meta.db_table} (wishlist_id, product_id, added_at) "
+                "VALUES (%s, %s, %s) "
+                "ON CONFLICT (wishlist_id, product_id) DO NOTHING RETURNING id",
+                [
+                    wishlist.pk,
+                    product_id,
+                    cls._meta.get_field('added_at').get_db_prep_value(added_at, connection),
+                ],
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+
+        item = cls(id=row[0], wishlist=wishlist, product_id=product_id, added_at=added_at)
+        item._state.adding = False
+        item._state.db = connection.alias
+        return item
+
@@ -2,11 +2,21 @@ from rest_framework import serializers
 from .models import Wishlist, WishlistItem
 
 
+class WishlistItemListSerializer(serializers.ListSerializer):
+    def get_attribute(self, instance):
+        # Views that already hold the items pass them in instead of re-reading them
+        items = self.context.get('wishlist_items')
+        if items is not None:
+            return items
+        return super().get_attribute(instance)
+
+
 class WishlistItemSerializer(serializers.ModelSerializer):
     class Meta:
         model = WishlistItem
         fields = ['id', 'product', 'added_at']
         read_only_fields = ['added_at']
+        list_serializer_class = WishlistItemListSerializer
 
 
 class AddToWishlistSerializer(serializers.Serializer):
@@ -14,18 +24,18 @@ class AddToWishlistSerializer(serializers.Serializer):
 
     def validate_product(self, value):
         from apps.products.models import Product
-        try:
-            product = Product.objects.get(pk=value)
-            if not product.is_active:
-                raise serializers.ValidationError("Product is not available")
-            return value
-        except Product.DoesNotExist:
+        # Only is_active is needed; None means the product doesn't exist
+        is_active = Product.objects.filter(pk=value).values_list('is_active', flat=True).first()
+        if is_active is None:
             raise serializers.ValidationError("Product not found")
+        if not is_active:
+            raise serializers.ValidationError("Product is not available")
+        return value
 
 
 class WishlistSerializer(serializers.ModelSerializer):
     items = WishlistItemSerializer(many=True, read_only=True)
-    items_count = serializers.ReadOnlyField()
+    items_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Wishlist
@@ -33,4 +43,10 @@ class WishlistSerializer(serializers.ModelSerializer):
             'id', 'user', 'items_count', 'items',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['user', 'created_at', 'updated_at']
\ No newline at end of file
+        read_only_fields = ['user', 'created_at', 'updated_at']
+
+    def get_items_count(self, obj) -> int:
+        items = self.context.get('wishlist_items')
+        if items is not None:
+            return len(items)
+        return obj.items_count
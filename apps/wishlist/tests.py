@@ -12,57 +12,60 @@ User = get_user_model()
 class WishlistAPITestCase(APITestCase):
     """Test case for Wishlist API endpoints."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
         # Create test users
-        self.user1 = User.objects.create_user(
+        cls.user1 = User.objects.create_user(
             username='testuser1',
             email='test1@example.com',
             password='testpass123'
         )
-        self.user2 = User.objects.create_user(
+        cls.user2 = User.objects.create_user(
             username='testuser2',
             email='test2@example.com', 
             password='testpass123'
         )
 
         # Create test category and products
-        self.category = Category.objects.create(
+        cls.category = Category.objects.create(
             name='Test Category',
             slug='test-category'
         )
         
-        self.product1 = Product.objects.create(
-            name='Test Product 1',
-            slug='test-product-1',
-            sku='TEST-PROD-001',
-            price=29.99,
-            is_active=True
-        )
-        self.product1.categories.add(self.category)
-        
-        self.product2 = Product.objects.create(
-            name='Test Product 2', 
-            slug='test-product-2',
-            sku='TEST-PROD-002',
-            price=39.99,
-            is_active=True
-        )
-        self.product2.categories.add(self.category)
-        
-        self.inactive_product = Product.objects.create(
-            name='Inactive Product',
-            slug='inactive-product',
-            sku='TEST-PROD-003',
-            price=19.99,
-            is_active=False
-        )
-        self.inactive_product.categories.add(self.category)
+        cls.product1, cls.product2, cls.inactive_product = Product.objects.bulk_create([
+            Product(
+                name='Test Product 1',
+                slug='test-product-1',
+                sku='TEST-PROD-001',
+                price=29.99,
+                is_active=True
+            ),
+            Product(
+                name='Test Product 2', 
+                slug='test-product-2',
+                sku='TEST-PROD-002',
+                price=39.99,
+                is_active=True
+            ),
+            Product(
+                name='Inactive Product',
+                slug='inactive-product',
+                sku='TEST-PROD-003',
+                price=19.99,
+                is_active=False
+            ),
+        ])
+        ProductCategory = Product.categories.through
+        ProductCategory.objects.bulk_create([
+            ProductCategory(product_id=product.id, category_id=cls.category.id)
+            for product in (cls.product1, cls.product2, cls.inactive_product)
+        ])
 
         # API endpoints
-        self.get_wishlist_url = reverse('get_wishlist')
-        self.add_to_wishlist_url = reverse('add_to_wishlist')
-        self.clear_wishlist_url = reverse('clear_wishlist')
+        cls.get_wishlist_url = reverse('get_wishlist')
+        cls.add_to_wishlist_url = reverse('add_to_wishlist')
+        cls.clear_wishlist_url = reverse('clear_wishlist')
 
     def get_remove_url(self, product_id):
         """Get remove from wishlist URL with product ID."""
@@ -112,12 +115,28 @@ class WishlistAPITestCase(APITestCase):
         self.assertIn(self.product1.id, product_ids)
         self.assertIn(self.product2.id, product_ids)
 
+    def test_get_wishlist_query_count(self):
+        """Items and their count come from a single prefetch query."""
+        self.authenticate_user(self.user1)
+        wishlist = Wishlist.objects.create(user=self.user1)
+        WishlistItem.objects.create(wishlist=wishlist, product=self.product1)
+        WishlistItem.objects.create(wishlist=wishlist, product=self.product2)
+
+        # wishlist + items
+        with self.assertNumQueries(2):
+            response = self.client.get(self.get_wishlist_url)
+
+        self.assertEqual(response.data['items_count'], 2)
+
     def test_add_to_wishlist_success(self):
         """Test successfully adding product to wishlist."""
         self.authenticate_user(self.user1)
         
         data = {'product': self.product1.id}
-        response = self.client.post(self.add_to_wishlist_url, data)
+        # product check, wishlist lookup, wishlist INSERT (in a savepoint), item INSERT;
+        # a new wishlist has no items to read back
+        with self.assertNumQueries(6):
+            response = self.client.post(self.add_to_wishlist_url, data)
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['items_count'], 1)
@@ -132,6 +151,23 @@ class WishlistAPITestCase(APITestCase):
             ).exists()
         )
 
+    def test_add_to_wishlist_with_existing_items(self):
+        """Test the new item is listed first without re-reading the wishlist."""
+        self.authenticate_user(self.user1)
+        wishlist = Wishlist.objects.create(user=self.user1)
+        WishlistItem.objects.create(wishlist=wishlist, product=self.product1)
+
+        # product check, wishlist + items, then the INSERT
+        with self.assertNumQueries(4):
+            response = self.client.post(self.add_to_wishlist_url, {'product': self.product2.id})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['items_count'], 2)
+        self.assertEqual(
+            [item['product'] for item in response.data['items']],
+            [self.product2.id, self.product1.id]
+        )
+
     def test_add_to_wishlist_unauthenticated(self):
         """Test adding to wishlist without authentication fails."""
         data = {'product': self.product1.id}
@@ -168,8 +204,9 @@ class WishlistAPITestCase(APITestCase):
         response = self.client.post(self.add_to_wishlist_url, data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         
-        # Try to add same product again
-        response = self.client.post(self.add_to_wishlist_url, data)
+        # Try to add same product again; caught before any INSERT
+        with self.assertNumQueries(3):
+            response = self.client.post(self.add_to_wishlist_url, data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('Product is already in your wishlist', str(response.data))
 
@@ -192,7 +229,9 @@ class WishlistAPITestCase(APITestCase):
         WishlistItem.objects.create(wishlist=wishlist, product=self.product1)
         WishlistItem.objects.create(wishlist=wishlist, product=self.product2)
         
-        response = self.client.delete(self.get_remove_url(self.product1.id))
+        # wishlist + items, then the DELETE
+        with self.assertNumQueries(3):
+            response = self.client.delete(self.get_remove_url(self.product1.id))
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['items_count'], 1)
@@ -247,7 +286,9 @@ class WishlistAPITestCase(APITestCase):
         WishlistItem.objects.create(wishlist=wishlist, product=self.product1)
         WishlistItem.objects.create(wishlist=wishlist, product=self.product2)
         
-        response = self.client.delete(self.clear_wishlist_url)
+        # wishlist + delete; the empty response needs no query
+        with self.assertNumQueries(2):
+            response = self.client.delete(self.clear_wishlist_url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['items_count'], 0)
@@ -300,27 +341,28 @@ class WishlistAPITestCase(APITestCase):
 class WishlistModelTestCase(TestCase):
     """Test case for Wishlist models."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
         
-        self.category = Category.objects.create(
+        cls.category = Category.objects.create(
             name='Test Category',
             slug='test-category'
         )
         
-        self.product = Product.objects.create(
+        cls.product = Product.objects.create(
             name='Test Product',
             slug='test-product',
             sku='TEST-MODEL-001',
             price=29.99,
             is_active=True
         )
-        self.product.categories.add(self.category)
+        cls.product.categories.add(cls.category)
 
     def test_wishlist_creation(self):
         """Test wishlist model creation."""
@@ -374,6 +416,18 @@ class WishlistModelTestCase(TestCase):
         wishlist.refresh_from_db()
         self.assertEqual(wishlist.items_count, 1)
 
+    def test_wishlist_item_add(self):
+        """Test WishlistItem.add inserts once and returns None for a duplicate."""
+        wishlist = Wishlist.objects.create(user=self.user)
+
+        item = WishlistItem.add(wishlist, self.product.id)
+        self.assertIsNotNone(item)
+        self.assertIsNone(WishlistItem.add(wishlist, self.product.id))
+
+        stored = WishlistItem.objects.get(wishlist=wishlist)
+        self.assertEqual(stored.pk, item.pk)
+        self.assertEqual(stored.added_at, item.added_at)
+
     def test_unique_constraint(self):
         """Test that the same product cannot be added twice to same wishlist."""
         wishlist = Wishlist.objects.create(user=self.user)
@@ -1,11 +1,11 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.db import IntegrityError
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
+from apps.core.renderers import ORJSONRenderer
 from .models import Wishlist, WishlistItem
 from .serializers import WishlistSerializer, AddToWishlistSerializer
 
@@ -29,9 +29,10 @@ from .serializers import WishlistSerializer, AddToWishlistSerializer
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@renderer_classes([ORJSONRenderer])
 def get_wishlist(request):
     """Get or create user's wishlist with all items."""
-    wishlist, _ = Wishlist.objects.get_or_create(user=request.user)
+    wishlist, _ = Wishlist.objects.prefetch_related('items').get_or_create(user=request.user)
     serializer = WishlistSerializer(wishlist, context={'request': request})
     return Response(serializer.data)
 
@@ -64,6 +65,7 @@ def get_wishlist(request):
 )
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@renderer_classes([ORJSONRenderer])
 def add_to_wishlist(request):
     """Add a product to user's wishlist."""
     serializer = AddToWishlistSerializer(data=request.data)
@@ -73,26 +75,27 @@ def add_to_wishlist(request):
     
     product_id = serializer.validated_data['product']
     
-    # Get or create user's wishlist
-    wishlist, _ = Wishlist.objects.get_or_create(user=request.user)
-    
-    try:
-        # Try to create the wishlist item
-        WishlistItem.objects.create(
-            wishlist=wishlist,
-            product_id=product_id
+    # Get or create user's wishlist, with its items for the duplicate check
+    wishlist, created = Wishlist.objects.prefetch_related('items').get_or_create(user=request.user)
+    items = [] if created else list(wishlist.items.all())
+
+    # item stays None for a duplicate, including one added concurrently
+    item = None
+    if not any(existing.product_id == product_id for existing in items):
+        item = WishlistItem.add(wishlist, product_id)
+
+    if item is not None:
+        # Return updated wishlist, newest first as in WishlistItem.Meta.ordering;
+        # saves re-reading the items
+        wishlist_serializer = WishlistSerializer(
+            wishlist, context={'request': request, 'wishlist_items': [item, *items]}
         )
-        
-        # Return updated wishlist
-        wishlist_serializer = WishlistSerializer(wishlist, context={'request': request})
         return Response(wishlist_serializer.data, status=status.HTTP_201_CREATED)
-        
-    except IntegrityError:
-        # Product is already in wishlist (unique constraint violation)
-        return Response(
-            {'error': 'Product is already in your wishlist'}, 
-            status=status.HTTP_400_BAD_REQUEST
-        )
+
+    return Response(
+        {'error': 'Product is already in your wishlist'}, 
+        status=status.HTTP_400_BAD_REQUEST
+    )
 
 
 @extend_schema(
@@ -130,34 +133,34 @@ def add_to_wishlist(request):
 )
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
+@renderer_classes([ORJSONRenderer])
 def remove_from_wishlist(request, product_id):
     """Remove a product from user's wishlist."""
-    # Get user's wishlist
+    # Get user's wishlist with its items
     try:
-        wishlist = Wishlist.objects.get(user=request.user)
+        wishlist = Wishlist.objects.prefetch_related('items').get(user=request.user)
     except Wishlist.DoesNotExist:
         return Response(
             {'error': 'Wishlist does not exist'}, 
             status=status.HTTP_404_NOT_FOUND
         )
     
-    # Find and delete the wishlist item
-    try:
-        wishlist_item = WishlistItem.objects.get(
-            wishlist=wishlist,
-            product_id=product_id
-        )
-        wishlist_item.delete()
-        
-        # Return updated wishlist
-        wishlist_serializer = WishlistSerializer(wishlist, context={'request': request})
-        return Response(wishlist_serializer.data)
-        
-    except WishlistItem.DoesNotExist:
+    # Find the item among the prefetched ones and delete it
+    items = list(wishlist.items.all())
+    wishlist_item = next((item for item in items if item.product_id == product_id), None)
+    if wishlist_item is None:
         return Response(
             {'error': 'Product not found in your wishlist'}, 
             status=status.HTTP_404_NOT_FOUND
         )
+    wishlist_item.delete()
+    remaining = [item for item in items if item is not wishlist_item]
+    
+    # Return updated wishlist
+    wishlist_serializer = WishlistSerializer(
+        wishlist, context={'request': request, 'wishlist_items': remaining}
+    )
+    return Response(wishlist_serializer.data)
 
 
 @extend_schema(
@@ -186,6 +189,7 @@ def remove_from_wishlist(request, product_id):
 )
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
+@renderer_classes([ORJSONRenderer])
 def clear_wishlist(request):
     """Clear all items from user's wishlist."""
     # Get user's wishlist
@@ -200,6 +204,8 @@ def clear_wishlist(request):
     # Delete all wishlist items
     wishlist.items.all().delete()
     
-    # Return empty wishlist
-    wishlist_serializer = WishlistSerializer(wishlist, context={'request': request})
+    # Return empty wishlist without reading the items back
+    wishlist_serializer = WishlistSerializer(
+        wishlist, context={'request': request, 'wishlist_items': []}
+    )
     return Response(wishlist_serializer.data)
@@ -33,7 +33,8 @@ LOGGING = {
             'class': 'logging.StreamHandler',
         },
         'file': {
-            'class': 'logging.FileHandler',
+            # Writes from a background thread
+            'class': 'apps.core.log_handlers.QueuedFileHandler',
             'filename': 'logs/django.log',
         },
     },
@@ -7,55 +7,59 @@ from .base import *
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = False
 
-# Database for production - using SQLite file for Vercel
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': '/tmp/vercel_db.sqlite3',  # Use /tmp for Vercel
+# Database for production: Postgres through a PgBouncer (transaction pooling)
+# endpoint when DATABASE_URL is set, otherwise an SQLite file for Vercel
+DATABASE_URL = os.environ.get('DATABASE_URL')
+if DATABASE_URL:
+    import dj_database_url
+    DATABASES = {
+        # The pooler keeps server connections warm; each invocation just
+        # opens a cheap socket to it, so don't hold or health-check ours
+        'default': dj_database_url.parse(DATABASE_URL, conn_max_age=0, conn_health_checks=False)
+    }
+    # Defaults only: options given in the URL query string (e.g. ?sslmode=) win
+    options = DATABASES['default'].setdefault('OPTIONS', {})
+    for key, value in {
+        'sslmode': 'require',
+        'connect_timeout': 10,
+        'application_name': 'django-vercel-app',
+        # No '-c statement_timeout' here: PgBouncer rejects the "options"
+        # startup parameter, set it on the role instead
+    }.items():
+        options.setdefault(key, value)
+    # Server-side cursors don't survive transaction pooling
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': '/tmp/vercel_db.sqlite3',  # Use /tmp for Vercel
+            # Reuse the connection across requests served by a warm instance
+            'CONN_MAX_AGE': 600,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                # WAL lets reads proceed during a write; NORMAL sync is safe under WAL
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA temp_store=MEMORY;'
+                    'PRAGMA mmap_size=134217728;'
+                    'PRAGMA cache_size=-20000;'
+                ),
+                'timeout': 20,
+            },
+        }
     }
-}
 
-# PostgreSQL config (commented out temporarily)
-# DATABASE_URL = os.environ.get('DATABASE_URL')
-# if DATABASE_URL:
-#     import dj_database_url
-#     DATABASES = {
-#         'default': dj_database_url.parse(DATABASE_URL, conn_max_age=0)
-#     }
-# else:
-#     DATABASES = {
-#         'default': {
-#             'ENGINE': 'django.db.backends.postgresql',
-#             'NAME': os.environ.get('POSTGRES_DATABASE', 'postgres'),
-#             'USER': os.environ.get('POSTGRES_USER', 'postgres'),
-#             'PASSWORD': os.environ.get('POSTGRES_PASSWORD'),
-#             'HOST': os.environ.get('POSTGRES_HOST'),
-#             'PORT': os.environ.get('POSTGRES_PORT', '5432'),
-#             'OPTIONS': {
-#                 'sslmode': 'require',
-#                 'connect_timeout': 10,
-#                 'application_name': 'django-vercel-app',
-#             },
-#             'CONN_MAX_AGE': 0,  # No connection pooling for serverless
-#         }
-#     }
+# English-only JSON API without LocaleMiddleware: skip loading translation catalogs
+USE_I18N = False
 
 # Static files (using Django defaults since we're not serving static files)
 
 # Enable DEBUG temporarily for debugging Vercel deployment
 DEBUG = True  # Set to False after deployment works
 
-# Remove problematic middleware for initial deployment
-MIDDLEWARE = [
-    'django.middleware.security.SecurityMiddleware',
-    'corsheaders.middleware.CorsMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-]
+# MIDDLEWARE comes from base.py unchanged
 
 # Media files (using Django defaults since we're not serving media files)
 
@@ -80,14 +84,16 @@ CSRF_COOKIE_HTTPONLY = True
 SECRET_KEY = os.environ.get('SECRET_KEY', 'temp-secret-key-for-debugging-change-in-production')
 # Note: Set SECRET_KEY environment variable in Vercel dashboard
 
-# CORS settings for production
+# CORS settings for production: comma-separated origins, e.g.
+# CORS_ALLOWED_ORIGINS=https://shop.example.com,https://admin.example.com
 CORS_ALLOWED_ORIGINS = [
-    "https://your-frontend-domain.vercel.app",  # Replace with your frontend domain
-    "https://your-custom-domain.com",  # Replace with your custom domain if any
+    origin.strip()
+    for origin in os.environ.get('CORS_ALLOWED_ORIGINS', '').split(',')
+    if origin.strip()
 ]
 
-# Allow all origins for development (remove this in production)
-CORS_ALLOW_ALL_ORIGINS = True  # Set to False and configure CORS_ALLOWED_ORIGINS properly
+# Allow all origins until the frontend origins are configured
+CORS_ALLOW_ALL_ORIGINS = not CORS_ALLOWED_ORIGINS
 
 # Trusted origins for CSRF
 CSRF_TRUSTED_ORIGINS = [
@@ -113,7 +119,9 @@ LOGGING = {
     'disable_existing_loggers': False,
     'handlers': {
         'console': {
-            'class': 'logging.StreamHandler',
+            # Serverless functions are frozen between invocations, which would
+            # strand records on the queue; write synchronously there
+            'class': 'logging.StreamHandler' if os.environ.get('VERCEL') else 'apps.core.log_handlers.QueuedStreamHandler',
         },
     },
     'loggers': {
@@ -8,9 +8,33 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 """
 
 import os
+import sys
+from io import BytesIO
 
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
 
 application = get_wsgi_application()
+
+# On Vercel, serve one synthetic health check while the function boots so the
+# urlconf, middleware chain and DB connection are built before the first real request
+if os.environ.get("VERCEL"):
+    warmup_response = application(
+        {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": "/api/health/",
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+            "HTTP_HOST": "localhost",
+            "wsgi.input": BytesIO(),
+            "wsgi.errors": sys.stderr,
+            "wsgi.url_scheme": "http",
+            "wsgi.multithread": False,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        },
+        lambda status, headers, exc_info=None: None,
+    )
+    # Closing is what fires request_finished (and close_old_connections)
+    warmup_response.close()
@@ -21,6 +21,6 @@ print(f"   Grand total: ${cart.grand_total}")
 print(f"   Currency: {cart.currency}")
 
 print(f"\n📦 Cart Items:")
-for item in cart.items.all():
+for item in cart.items.only('product_name_snapshot', 'quantity', 'unit_price_snapshot').iterator(chunk_size=100):
     print(f"   - {item.product_name_snapshot}: qty={item.quantity}, price=${item.unit_price_snapshot}")
     print(f"     Total: ${item.quantity * item.unit_price_snapshot}")
\ No newline at end of file
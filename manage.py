@@ -6,7 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.development")
+    # Tests default to in-memory SQLite and fast hashing (config.settings.testing)
+    default_settings = "config.settings.testing" if sys.argv[1:2] == ["test"] else "config.settings.development"
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", default_settings)
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 import requests
 import json
+import hashlib
+import time
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Get a valid token
 import os, django, sys
@@ -8,36 +13,64 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
 sys.path.append('/Users/farawa/ecom-backend')
 django.setup()
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import RefreshToken
 from apps.authentication.models import UserSession
 
 User = get_user_model()
 user = User.objects.get(email='test@example.com')
-refresh = RefreshToken.for_user(user)
-
-# Create session
-session, _ = UserSession.objects.get_or_create(
-    user=user,
-    session_key='test_session_3',
-    defaults={
-        'jti': refresh['jti'],
-        'access_jti': refresh.access_token['jti'],
-        'ip_address': '127.0.0.1',
-        'device_info': 'test_script',
-        'is_active': True
-    }
-)
 
-token = str(refresh.access_token)
+# Reuse the last signed access token until it is about to expire. It's a live
+# bearer token, so keep it in the user's own cache dir, readable only by them
+JWT_CACHE = Path.home() / '.cache' / 'ecom-backend' / 'jwt.json'
+cache_key = f"{user.pk}:{hashlib.sha256(settings.SECRET_KEY.encode()).hexdigest()[:16]}"
+try:
+    cached = json.loads(JWT_CACHE.read_text())
+except (OSError, ValueError):
+    cached = {}
+
+if cached.get('key') == cache_key and cached.get('exp', 0) > time.time() + 60:
+    token = cached['access']
+else:
+    refresh = RefreshToken.for_user(user)
+    # access_token mints a new token (and jti) on every access, so read it once
+    access = refresh.access_token
+
+    # Create session
+    session, _ = UserSession.objects.get_or_create(
+        user=user,
+        session_key='test_session_3',
+        defaults={
+            'jti': refresh['jti'],
+            'access_jti': access['jti'],
+            'ip_address': '127.0.0.1',
+            'device_info': 'test_script',
+            'is_active': True
+        }
+    )
+
+    token = str(access)
+    JWT_CACHE.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd = os.open(JWT_CACHE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(fd, 0o600)  # in case an older file was created with wider permissions
+    with os.fdopen(fd, 'w') as f:
+        json.dump({
+            'key': cache_key,
+            'access': token,
+            'exp': access['exp'],
+        }, f)
+
 NGROK_URL = "https://248c50000662.ngrok-free.app"
 
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4,
+                                      max_retries=Retry(total=2, backoff_factor=0.2)))
+SESSION.headers.update({'Content-Type': 'application/json'})
+
 # Test create payment
 url = f"{NGROK_URL}/api/v1/payments/create/"
-headers = {
-    'Authorization': f'Bearer {token}',
-    'Content-Type': 'application/json'
-}
+headers = {'Authorization': f'Bearer {token}'}
 
 data = {
     'payment_method': 'PAYPAL',
@@ -57,6 +90,6 @@ print("🔥 Creating PayPal payment...")
 print(f"URL: {url}")
 print(f"Data: {json.dumps(data, indent=2)}")
 
-response = requests.post(url, headers=headers, json=data)
+response = SESSION.post(url, headers=headers, json=data)
 print(f"Status: {response.status_code}")
 print(f"Response: {response.text}")
\ No newline at end of file